@@ -21,5 +21,6 @@ def discover_companies_node(state: Dict) -> Dict:
         "companies": companies,
         "high_fit_companies": high_fit,
         "processed_companies": [],
-        "sent_emails": []
+        "sent_emails": [],
+        "suppressed": []
     }
\ No newline at end of file
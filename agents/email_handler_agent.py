@@ -4,6 +4,7 @@ Email Handler Agent
 
 from typing import Optional, List, Dict
 from datetime import datetime
+from suppression import SuppressionStore
 
 
 def classify_response(email_content: str) -> str:
@@ -13,11 +14,15 @@ def classify_response(email_content: str) -> str:
     """
     content_lower = email_content.lower()
     
-    if any(word in content_lower for word in ["interested", "yes", "call", "meeting", "discuss"]):
+    # Explicit opt-outs first: "interested", "call" and "discuss" also appear in them
+    if any(phrase in content_lower for phrase in ["unsubscribe", "remove me", "take me off", "not interested",
+                                                  "stop emailing", "opt out"]):
+        return "NEGATIVE"
+    elif any(word in content_lower for word in ["interested", "yes", "call", "meeting", "discuss"]):
         return "POSITIVE_INTEREST"
     elif any(word in content_lower for word in ["pricing", "cost", "how much", "features", "demo"]):
         return "QUESTIONS"
-    elif any(word in content_lower for word in ["not interested", "no thank", "remove", "unsubscribe"]):
+    elif any(word in content_lower for word in ["no thank", "remove"]):
         return "NEGATIVE"
     elif any(word in content_lower for word in ["out of office", "away", "vacation"]):
         return "OUT_OF_OFFICE"
@@ -63,6 +68,22 @@ Alternatively, feel free to reply with specific questions and I'll address them
         return None
 
 
+def handle_reply(from_email: str, email_content: str, store: Optional[SuppressionStore] = None) -> Dict:
+    """
+    Classify a reply, draft the auto-response and feed NEGATIVE replies
+    (unsubscribe, remove, not interested) into the suppression store
+    """
+    classification = classify_response(email_content)
+    if classification == "NEGATIVE":
+        store = store or SuppressionStore()
+        store.add_and_save(emails={from_email: "negative_reply"})
+    return {
+        "from": from_email,
+        "classification": classification,
+        "auto_response": generate_auto_response(classification, email_content)
+    }
+
+
 def escalate_to_human(contact_id: str, company_intelligence: Dict, 
                        conversation_history: List[Dict]) -> Dict:
     """
@@ -0,0 +1,72 @@
+"""
+Fast local heuristics for ranking outreach email candidates
+"""
+
+import re
+from typing import Dict, List
+
+MAX_SUBJECT_CHARS = 60
+MIN_WORDS = 200
+MAX_WORDS = 300
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"and", "the", "for", "with", "from", "into", "across", "their", "your", "that",
+              "this", "need", "needs", "unable", "difficulty", "limited", "growing", "high"}
+
+
+def _keywords(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if len(w) > 3 and w not in _STOPWORDS]
+
+
+def _coverage(phrases: List[str], body_words: set) -> float:
+    """Fraction of phrases with at least half of their keywords present in the body"""
+    if not phrases:
+        return 1.0
+    hits = 0
+    for phrase in phrases:
+        keywords = _keywords(phrase)
+        if keywords and sum(w in body_words for w in keywords) * 2 >= len(keywords):
+            hits += 1
+    return hits / len(phrases)
+
+
+def score_email(subject: str, body: str, challenges: List[str], opportunities: List[str]) -> Dict:
+    """
+    Score a candidate email in [0, 1] with a per-check breakdown.
+    Missing CTA or unsubscribe footer caps the score, so a compliant
+    candidate always outranks a non-compliant one.
+    """
+    body_lower = body.lower()
+    body_words = set(_WORD.findall(body_lower))
+    word_count = len(body.split())
+
+    if word_count < MIN_WORDS:
+        length_score = word_count / MIN_WORDS
+    elif word_count > MAX_WORDS:
+        length_score = max(0.0, 1 - (word_count - MAX_WORDS) / MAX_WORDS)
+    else:
+        length_score = 1.0
+
+    checks = {
+        "subject_length": 1.0 if 0 < len(subject) <= MAX_SUBJECT_CHARS else 0.0,
+        "word_count": length_score,
+        "challenges": _coverage(challenges, body_words),
+        "opportunities": _coverage(opportunities, body_words),
+        "cta": 1.0 if "[calendar link]" in body_lower or ("call" in body_words and "book" in body_words) else 0.0,
+        "unsubscribe": 1.0 if "unsubscribe" in body_words else 0.0
+    }
+    weights = {"subject_length": 0.15, "word_count": 0.25, "challenges": 0.3, "opportunities": 0.3}
+    score = sum(checks[name] * weight for name, weight in weights.items())
+    if not (checks["cta"] and checks["unsubscribe"]):
+        score *= 0.5
+    return {"score": round(score, 4), "checks": checks, "word_count": word_count}
+
+
+def rank_candidates(candidates: List[Dict], challenges: List[str], opportunities: List[str]) -> List[Dict]:
+    """Return candidates (dicts with subject/body) annotated with scores, best first"""
+    scored = []
+    for candidate in candidates:
+        result = score_email(candidate["subject"], candidate["body"], challenges, opportunities)
+        scored.append({"subject": candidate["subject"], "body": candidate["body"],
+                       "score": result["score"], "checks": result["checks"]})
+    return sorted(scored, key=lambda c: c["score"], reverse=True)
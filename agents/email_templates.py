@@ -0,0 +1,119 @@
+"""
+Precompiled per-industry outreach email templates
+"""
+
+import re
+from string import Template
+from typing import Dict, List, Optional, Tuple
+from models import Company
+from data.industry_data import USE_CASES, get_use_case
+
+SUBJECT = Template("Helping $company_name unlock customer intelligence")
+
+DEFAULT_OPENING = Template(
+    "I hope this email finds you well. I came across $company_name and was impressed by your work in the "
+    "$industry_lower space, particularly your focus on serving the $city market."
+)
+
+BODY = Template("""Hi $first_name,
+
+$opening
+
+I noticed that $company_name is likely facing challenges around $challenge. This is a common pain point we see with companies at your scale, and it's exactly what Lucidya was built to solve.
+
+Lucidya is an AI-powered customer intelligence platform specifically designed for the MENA region. We help companies like yours:
+• $opportunity_1
+• $opportunity_2
+
+One of our clients in the $industry_lower space had similar challenges. $use_case_description
+
+The results: $metrics.
+
+Given $company_name's focus on innovation and your role as $title, I thought this might be relevant. Would you be open to a brief 20-minute conversation to explore how Lucidya could help $company_name achieve similar results?
+
+I'm happy to work around your schedule. You can book a time directly here: [Calendar Link]
+
+Best regards,
+Sales Team
+Lucidya
+www.lucidya.com
+
+P.S. - We offer native Arabic language support and dialect detection, which I understand is particularly important for your market.
+
+---
+If you'd prefer not to receive emails from us, you can unsubscribe here: [Unsubscribe Link]""")
+
+MAX_OPENING_WORDS = 70  # the prompt asks for under 60; allow a little slack
+
+_compiled: Dict[str, Tuple[Template, Template]] = {}
+
+
+_PREAMBLE = re.compile(r"^(here(['’]s| is| are)\b|sure\b|certainly\b)", re.IGNORECASE)
+
+
+def _is_preamble(line: str) -> bool:
+    return line.endswith(':') or bool(_PREAMBLE.match(line))
+
+
+def clean_opening(raw: str) -> str:
+    """
+    Extract the opening paragraph from LLM output, skipping lead-ins such as
+    "Here's the opening paragraph:". Raises ValueError if nothing usable is left.
+    """
+    for block in raw.strip().split("\n\n"):
+        lines = [line.strip() for line in block.strip().splitlines() if line.strip()]
+        while lines and _is_preamble(lines[0]):
+            lines.pop(0)
+        if lines:
+            opening = " ".join(lines).strip().strip('"').strip()
+            break
+    else:
+        raise ValueError("Empty opening paragraph")
+    if not opening or opening == 'null' or _is_preamble(opening):
+        raise ValueError(f"Opening paragraph is only a preamble: {opening!r}")
+    if len(opening.split()) > MAX_OPENING_WORDS:
+        raise ValueError(f"Opening paragraph too long ({len(opening.split())} words)")
+    return opening
+
+
+def _escape(value: str) -> str:
+    return value.replace("$", "$$")
+
+
+def compile_industry(industry: str) -> Tuple[Template, Template]:
+    """Bake the industry-constant fields (use case, metrics) into the opening and body templates once"""
+    if industry not in _compiled:
+        use_case = get_use_case(industry)
+        constants = {
+            "industry_lower": _escape(industry.lower()),
+            "use_case_description": _escape(use_case["description"]),
+            "metrics": _escape(use_case["metrics"])
+        }
+        _compiled[industry] = (
+            Template(DEFAULT_OPENING.safe_substitute(constants)),
+            Template(BODY.safe_substitute(constants))
+        )
+    return _compiled[industry]
+
+
+for _industry in USE_CASES:
+    compile_industry(_industry)
+
+
+def render_email(contact: Dict, company: Company, opportunities: List[str],
+                 opening: Optional[str] = None) -> Tuple[str, str]:
+    """Render (subject, body); `opening` replaces the default first paragraph (hybrid mode)"""
+    opening_template, body_template = compile_industry(company.industry)
+    city = company.location.split(',')[0]
+    if opening is None:
+        opening = opening_template.substitute(company_name=company.name, city=city)
+    body = body_template.substitute(
+        first_name=contact['name'].split()[0],
+        opening=opening,
+        company_name=company.name,
+        challenge=company.challenges[0].lower(),
+        opportunity_1=opportunities[0] if opportunities else 'Social Listening & Sentiment Analysis',
+        opportunity_2=opportunities[1] if len(opportunities) > 1 else 'Omnichannel Analytics',
+        title=contact['title']
+    )
+    return SUBJECT.substitute(company_name=company.name), body
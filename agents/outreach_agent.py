@@ -2,18 +2,35 @@
 Outreach Agent: LangChain chain for email generation
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser, JsonOutputParser
-from config import llm, EmailOutput
+from config import OUTREACH_MODE, OUTREACH_MODES, NUM_VARIANTS, SUPPRESS_EMAILED
 from models import Contact, OutreachEmail, Company
+from agents.email_templates import render_email, clean_opening
+from agents.email_scoring import rank_candidates
+from data.industry_data import get_use_case
+from task_queue import TaskQueue, run_worker, run_key, DONE
+from suppression import SuppressionStore
 import json
 import re
 
 
 class OutreachChain:
-    def __init__(self):
+    def __init__(self, mode: str = OUTREACH_MODE, num_variants: int = NUM_VARIANTS):
+        if mode not in OUTREACH_MODES:
+            raise ValueError(f"Unknown outreach mode {mode!r}; expected one of {OUTREACH_MODES}")
+        self.mode = mode
+        self.chain = None
+        self.opening_chain = None
+        self.variants_chain = None
+        self.num_variants = num_variants
+    
+    def _build_chains(self):
+        """Import LangChain and build the prompt chains on first use (never in template mode)"""
+        from langchain.prompts import PromptTemplate
+        from langchain_core.output_parsers import PydanticOutputParser, JsonOutputParser
+        from llm_client import get_llm, EmailOutput
+        
         pydantic_parser = PydanticOutputParser(pydantic_object=EmailOutput)
         json_parser = JsonOutputParser(pydantic_object=EmailOutput) 
         
@@ -45,109 +62,198 @@ class OutreachChain:
             input_variables=["contact_name", "title", "company_name", "industry", "size", "location", "description", "insights", "challenges", "opportunities", "use_case_description", "metrics"],
             partial_variables={"format_instructions": pydantic_parser.get_format_instructions()},
         )
-        self.chain = prompt | llm
+        opening_prompt = PromptTemplate(
+            template="""
+            Write the opening paragraph of a cold outreach email from Lucidya (AI customer intelligence for MENA).
+            
+            Recipient: {contact_name}, {title} at {company_name}
+            Company: {company_name}, {industry}, {location}
+            Description: {description}
+            Key Insights: {insights}
+            
+            Write 2-3 sentences (under 60 words) showing you know the company and its market. No greeting, no sign-off, no pitch, no quotes—output only the paragraph text.
+            """,
+            input_variables=["contact_name", "title", "company_name", "industry", "location", "description", "insights"],
+        )
+        self.chain = prompt | get_llm()
         self.pydantic_parser = pydantic_parser
         self.json_parser = json_parser
-        self.use_cases = {
-            "E-Commerce": {
-                "title": "Cart Abandonment Recovery",
-                "description": "A leading fashion retailer reduced cart abandonment by 23% by analyzing customer sentiment during checkout and proactively addressing concerns.",
-                "metrics": "23% reduction in cart abandonment, $2.1M additional revenue"
-            },
-            "Retail Technology": {
-                "title": "Omnichannel Experience Optimization",
-                "description": "A major retail chain unified customer feedback from online and in-store channels, identifying and resolving pain points 3x faster.",
-                "metrics": "3x faster issue resolution, 18-point NPS increase"
-            },
-            "Healthcare Technology": {
-                "title": "Patient Satisfaction Monitoring",
-                "description": "A telehealth platform automated patient feedback analysis across all touchpoints, improving response time to concerns by 65%.",
-                "metrics": "65% faster response time, 94% patient satisfaction score"
-            }
-        }
+        variants_prompt = PromptTemplate(
+            template="""
+            Write {num_variants} alternative subject lines and opening paragraphs for a cold outreach email from Lucidya (AI customer intelligence for MENA), for A/B testing.
+            
+            Recipient: {contact_name}, {title} at {company_name}
+            Company: {company_name}, {industry}, {location}
+            Description: {description}
+            Key Insights: {insights}
+            Challenges: {challenges}
+            
+            Each variant must take a different angle. subject: engaging, personalized (under 60 chars). opening: 2-3 sentences (under 60 words) showing you know the company and its market; no greeting, no sign-off, no pitch.
+            IMPORTANT: Respond ONLY with valid JSON, no extra text, explanations, or markdown.
+            Example JSON output:
+            {{"variants": [{{"subject": "Helping {company_name} Unlock Insights", "opening": "[2-3 sentence opening paragraph]"}}]}}
+            """,
+            input_variables=["contact_name", "title", "company_name", "industry", "location", "description", "insights", "challenges"],
+            partial_variables={"num_variants": str(self.num_variants)},
+        )
+        self.opening_chain = opening_prompt | get_llm()
+        self.variants_chain = variants_prompt | get_llm()
+    
+    def _company_context(self, intelligence: Dict):
+        company = Company(**intelligence['company'])
+        use_case = get_use_case(company.industry)
+        return company, intelligence['opportunity_areas'], intelligence['key_insights'], use_case
     
     def generate_email(self, contact: Dict, intelligence: Dict) -> OutreachEmail:
-        company_dict = intelligence['company']
-        company = Company(**company_dict)
-        opportunities = intelligence['opportunity_areas']
-        insights = intelligence['key_insights']
-        use_case = self.use_cases.get(company.industry, self.use_cases["E-Commerce"])
+        """Generate an email in the configured mode; raises on LLM or parsing failure"""
+        if self.mode == "hybrid":
+            return self.generate_hybrid_email(contact, intelligence)
+        if self.mode == "variants":
+            return self.generate_variant_email(contact, intelligence)
+        if self.mode == "template":
+            company, opportunities, insights, use_case = self._company_context(intelligence)
+            subject, body = render_email(contact, company, opportunities)
+            return self._build_email(contact, company, opportunities, subject, body)
+        return self.generate_llm_email(contact, intelligence)
+    
+    def generate_hybrid_email(self, contact: Dict, intelligence: Dict) -> OutreachEmail:
+        """LLM writes only the opening paragraph; the rest comes from the precompiled industry template"""
+        company, opportunities, insights, use_case = self._company_context(intelligence)
+        
+        if self.opening_chain is None:
+            self._build_chains()
+        print(f"Outreach Agent: Personalizing opening for {contact['name']}...")
+        raw_output = self.opening_chain.invoke({
+            "contact_name": contact['name'],
+            "title": contact['title'],
+            "company_name": company.name,
+            "industry": company.industry,
+            "location": company.location,
+            "description": company.description,
+            "insights": ", ".join(insights)
+        })
+        opening = clean_opening(str(raw_output))
+        
+        subject, body = render_email(contact, company, opportunities, opening=opening)
+        return self._build_email(contact, company, opportunities, subject, body)
+    
+    def generate_llm_email(self, contact: Dict, intelligence: Dict) -> OutreachEmail:
+        """Fully LLM-generated email"""
+        company, opportunities, insights, use_case = self._company_context(intelligence)
         
+        from llm_client import EmailOutput
+        if self.chain is None:
+            self._build_chains()
         print(f"Outreach Agent: Crafting personalized email for {contact['name']}...")
-        try:
-            raw_output = self.chain.invoke({
-                "contact_name": contact['name'],
-                "title": contact['title'],
-                "company_name": company.name,
-                "industry": company.industry,
-                "size": company.size,
-                "location": company.location,
-                "description": company.description,
-                "insights": ", ".join(insights),
-                "challenges": ", ".join(company.challenges),
-                "opportunities": ", ".join(opportunities),
-                "use_case_description": use_case['description'],
-                "metrics": use_case['metrics']
-            })
-            raw_text = str(raw_output).strip()
-            
-            if not raw_text or raw_text == 'null':
-                raise ValueError("Empty output")
-
-            raw_text = raw_text.replace('", "', '","') 
-            raw_text = re.sub(r'(\w+):(\s*)(\{)', r'\1: \3', raw_text)  
-
-            try:
-                email_out = self.pydantic_parser.parse(raw_text)
-            except Exception:
-                match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                    try:
-                        parsed = json.loads(json_str)
-                    except json.JSONDecodeError as je:
-                        fixed_str = re.sub(r'([}\]])\s*([{\[])', r'\1, \2', json_str)
-                        parsed = json.loads(fixed_str)
-                    if "value" in parsed:
-                        parsed = parsed["value"]
-                    email_out = EmailOutput(**parsed)
-                else:
-                    email_out = self.json_parser.parse(raw_text)
-            
-            subject = email_out.subject
-            body = email_out.body
-            print("LLM-generated email successful")
-        except Exception as e:
-            print(f"LangChain error: {e}. Fallback to template.")
-            subject = f"Helping {company.name} unlock customer intelligence"
-            body = f"""Hi {contact['name'].split()[0]},
-
-I hope this email finds you well. I came across {company.name} and was impressed by your work in the {company.industry.lower()} space, particularly your focus on serving the {company.location.split(',')[0]} market.
-
-I noticed that {company.name} is likely facing challenges around {company.challenges[0].lower()}. This is a common pain point we see with companies at your scale, and it's exactly what Lucidya was built to solve.
-
-Lucidya is an AI-powered customer intelligence platform specifically designed for the MENA region. We help companies like yours:
-• {opportunities[0] if opportunities else 'Social Listening & Sentiment Analysis'}
-• {opportunities[1] if len(opportunities) > 1 else 'Omnichannel Analytics'}
-
-One of our clients in the {company.industry.lower()} space had similar challenges. {use_case['description']}
-
-The results: {use_case['metrics']}.
+        raw_output = self.chain.invoke({
+            "contact_name": contact['name'],
+            "title": contact['title'],
+            "company_name": company.name,
+            "industry": company.industry,
+            "size": company.size,
+            "location": company.location,
+            "description": company.description,
+            "insights": ", ".join(insights),
+            "challenges": ", ".join(company.challenges),
+            "opportunities": ", ".join(opportunities),
+            "use_case_description": use_case['description'],
+            "metrics": use_case['metrics']
+        })
+        raw_text = str(raw_output).strip()
 
-Given {company.name}'s focus on innovation and your role as {contact['title']}, I thought this might be relevant. Would you be open to a brief 20-minute conversation to explore how Lucidya could help {company.name} achieve similar results?
+        if not raw_text or raw_text == 'null':
+            raise ValueError("Empty output")
 
-I'm happy to work around your schedule. You can book a time directly here: [Calendar Link]
+        raw_text = raw_text.replace('", "', '","') 
+        raw_text = re.sub(r'(\w+):(\s*)(\{)', r'\1: \3', raw_text)  
 
-Best regards,
-Sales Team
-Lucidya
-www.lucidya.com
-
-P.S. - We offer native Arabic language support and dialect detection, which I understand is particularly important for your market.
+        try:
+            email_out = self.pydantic_parser.parse(raw_text)
+        except Exception:
+            match = re.search(r'\{.*\}', raw_text, re.DOTALL)
+            if match:
+                json_str = match.group(0)
+                try:
+                    parsed = json.loads(json_str)
+                except json.JSONDecodeError as je:
+                    fixed_str = re.sub(r'([}\]])\s*([{\[])', r'\1, \2', json_str)
+                    parsed = json.loads(fixed_str)
+                if "value" in parsed:
+                    parsed = parsed["value"]
+                email_out = EmailOutput(**parsed)
+            else:
+                email_out = self.json_parser.parse(raw_text)
 
----
-If you'd prefer not to receive emails from us, you can unsubscribe here: [Unsubscribe Link]"""
+        subject = email_out.subject
+        body = email_out.body
+        print("LLM-generated email successful")
+        return self._build_email(contact, company, opportunities, subject, body)
+    
+    def generate_variant_email(self, contact: Dict, intelligence: Dict) -> OutreachEmail:
+        """
+        One LLM call returns num_variants subject/opening pairs; each is rendered
+        into the precompiled industry template, the rendered emails are ranked
+        with local heuristics, the best is sent and the rest are kept as A/B alternates.
+        """
+        company, opportunities, insights, use_case = self._company_context(intelligence)
+        
+        if self.variants_chain is None:
+            self._build_chains()
+        print(f"Outreach Agent: Drafting {self.num_variants} variants for {contact['name']}...")
+        raw_output = self.variants_chain.invoke({
+            "contact_name": contact['name'],
+            "title": contact['title'],
+            "company_name": company.name,
+            "industry": company.industry,
+            "location": company.location,
+            "description": company.description,
+            "insights": ", ".join(insights),
+            "challenges": ", ".join(company.challenges)
+        })
+        raw_text = str(raw_output).strip()
+        
+        match = re.search(r'[\{\[].*[\}\]]', raw_text, re.DOTALL)
+        if not match:
+            raise ValueError("No JSON in variants output")
+        json_str = match.group(0)
+        try:
+            parsed = json.loads(json_str)
+        except json.JSONDecodeError:
+            fixed_str = re.sub(r'([}\]])\s*([{\[])', r'\1, \2', json_str)
+            parsed = json.loads(fixed_str)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("variants", [parsed])
         
+        candidates = []
+        for variant in parsed:
+            if not (isinstance(variant, dict) and isinstance(variant.get("subject"), str)
+                    and isinstance(variant.get("opening"), str) and variant["subject"].strip()):
+                continue
+            try:
+                opening = clean_opening(variant["opening"])
+            except ValueError:
+                continue
+            _, body = render_email(contact, company, opportunities, opening=opening)
+            candidates.append({"subject": variant["subject"].strip(), "body": body})
+        if not candidates:
+            raise ValueError("No usable subject/opening candidates in variants output")
+        
+        ranked = rank_candidates(candidates, company.challenges, opportunities)
+        best = ranked[0]
+        print(f"Kept best of {len(ranked)} variants (score {best['score']})")
+        return self._build_email(contact, company, opportunities, best["subject"], best["body"],
+                                 score=best["score"], variants=ranked[1:])
+    
+    def fallback_email(self, contact: Dict, intelligence: Dict, reason: str) -> OutreachEmail:
+        """Template email used once every retry of an outreach job is exhausted"""
+        company, opportunities, insights, use_case = self._company_context(intelligence)
+        print(f"Outreach Agent: Retries exhausted for {contact['name']} ({reason}). Fallback to template.")
+        subject, body = render_email(contact, company, opportunities)
+        return self._build_email(contact, company, opportunities, subject, body, is_fallback=True)
+    
+    def _build_email(self, contact: Dict, company: Company, opportunities: List[str],
+                     subject: str, body: str, is_fallback: bool = False,
+                     score: Optional[float] = None, variants: Optional[List[Dict]] = None) -> OutreachEmail:
         personalization_factors = [
             f"Industry: {company.industry}",
             f"Title: {contact['title']}",
@@ -161,20 +267,57 @@ If you'd prefer not to receive emails from us, you can unsubscribe here: [Unsubs
             subject=subject,
             body=body,
             generated_at=datetime.now().isoformat(),
-            personalization_factors=personalization_factors
+            personalization_factors=personalization_factors,
+            is_fallback=is_fallback,
+            score=score,
+            variants=variants or []
         )
 
 
 def outreach_node(state: Dict) -> Dict:
-    """Node: Generate emails for each processed company"""
+    """Node: Generate emails for each non-suppressed contact through the durable job queue"""
     chain = OutreachChain()
-    sent_emails = []
+    store = SuppressionStore()
+    suppressed = list(state.get("suppressed", []))
+    to_generate = []
     for processed in state["processed_companies"]:
         for contact in processed["contacts"]:
-            email = chain.generate_email(contact, processed["intelligence"])
+            # Re-checked here: replies classified since research may have suppressed the contact
+            reason = store.contact_reason(contact["email"])
+            if reason:
+                print(f"Outreach Agent: Skipping {contact['name']} (suppressed: {reason})")
+                suppressed.append({"contact_id": contact["id"], "email": contact["email"], "reason": reason})
+                continue
+            to_generate.append({"contact": contact, "intelligence": processed["intelligence"]})
+    
+    emailed = {}
+    queue = TaskQueue()
+    try:
+        run_id = run_key("outreach", to_generate)
+        queue.attach(run_id)
+        resumed = sum(not queue.enqueue(run_id, "outreach", payload["contact"]["id"], payload) for payload in to_generate)
+        if resumed:
+            print(f"Outreach Agent: Resuming {resumed} job(s) from an interrupted run")
+        run_worker(queue, run_id, {
+            "outreach": lambda payload: chain.generate_email(payload["contact"], payload["intelligence"]).to_dict()
+        })
+        
+        sent_emails = []
+        for job in queue.jobs(run_id, "outreach"):
+            payload = json.loads(job["payload"])
+            if job["status"] == DONE:
+                email = json.loads(job["result"])
+            else:
+                email = chain.fallback_email(payload["contact"], payload["intelligence"], job["last_error"]).to_dict()
             sent_emails.append({
-                "contact": contact,
-                "email": email.to_dict(), 
-                "company_intelligence": processed["intelligence"]
+                "contact": payload["contact"],
+                "email": email, 
+                "company_intelligence": payload["intelligence"]
             })
-    return {"sent_emails": sent_emails}
\ No newline at end of file
+            if SUPPRESS_EMAILED:
+                emailed[payload["contact"]["email"]] = "emailed"
+        queue.finish_run(run_id)
+    finally:
+        queue.close()
+    store.add_and_save(emails=emailed)
+    return {"sent_emails": sent_emails, "suppressed": suppressed}
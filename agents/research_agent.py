@@ -3,17 +3,25 @@ Research Agent: LangChain chain for company intelligence
 """
 
 from typing import Dict, List
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser, JsonOutputParser
-from config import llm, CompanyIntelligence
 from models import Company
 from data.mock_data import MOCK_CONTACTS
+from data.industry_data import get_mock_research, MOCK_COMPETITIVE_CONTEXT
+from task_queue import TaskQueue, run_worker, run_key, DONE
+from suppression import SuppressionStore
 import json
 import re
 
 
 class ResearchChain:
     def __init__(self):
+        self.chain = None
+    
+    def _build_chain(self):
+        """Import LangChain and build the prompt chain on first use"""
+        from langchain.prompts import PromptTemplate
+        from langchain_core.output_parsers import PydanticOutputParser, JsonOutputParser
+        from llm_client import get_llm, CompanyIntelligence
+        
         pydantic_parser = PydanticOutputParser(pydantic_object=CompanyIntelligence)
         json_parser = JsonOutputParser(pydantic_object=CompanyIntelligence)  
         
@@ -43,68 +51,64 @@ class ResearchChain:
             input_variables=["company_name", "industry", "size", "location", "description", "challenges"],
             partial_variables={"format_instructions": pydantic_parser.get_format_instructions()},
         )
-        self.chain = prompt | llm
+        self.chain = prompt | get_llm()
         self.pydantic_parser = pydantic_parser
         self.json_parser = json_parser
     
     def research_company(self, company: Company) -> Dict:
-        """Generate intelligence for a company"""
+        """Generate intelligence for a company; raises on LLM or parsing failure"""
+        from llm_client import CompanyIntelligence
+        if self.chain is None:
+            self._build_chain()
         print(f"Research Agent: Analyzing {company.name}...")
+        raw_output = self.chain.invoke({
+            "company_name": company.name,
+            "industry": company.industry,
+            "size": company.size,
+            "location": company.location,
+            "description": company.description,
+            "challenges": ", ".join(company.challenges)
+        })
+        raw_text = str(raw_output).strip()  
+        if not raw_text or raw_text == 'null' or 'properties' in raw_text and 'required' in raw_text:
+            raise ValueError("Schema echo or empty output—rejecting")
+        
         try:
-            raw_output = self.chain.invoke({
-                "company_name": company.name,
-                "industry": company.industry,
-                "size": company.size,
-                "location": company.location,
-                "description": company.description,
-                "challenges": ", ".join(company.challenges)
-            })
-            raw_text = str(raw_output).strip()  
-            if not raw_text or raw_text == 'null' or 'properties' in raw_text and 'required' in raw_text:
-                raise ValueError("Schema echo or empty output—rejecting")
-            
-            try:
-                intel = self.pydantic_parser.parse(raw_text)
-            except Exception:
-                match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                    parsed = json.loads(json_str)
-                    if "value" in parsed:
-                        parsed = parsed["value"]
-                    intel = CompanyIntelligence(**parsed)
-                else:
-                    intel = self.json_parser.parse(raw_text)
-            
-            print(f"   ✓ Identified {len(intel.opportunity_areas)} opportunity areas\n")
-            return {
-                "company": company.to_dict(),
-                "key_insights": intel.key_insights,
-                "pain_points": company.challenges,
-                "opportunity_areas": intel.opportunity_areas,
-                "competitive_context": intel.competitive_context
-            }
-        except Exception as e:
-            print(f"LangChain error: {e}. Fallback to mock.")
-            if "E-Commerce" in company.industry:
-                mock_insights = ["High volume of customer interactions across multiple channels", "Need for real-time sentiment analysis during peak seasons"]
-                mock_opps = ["Social Listening & Sentiment Analysis", "Arabic NLP & Dialect Detection"]
-            elif "Retail" in company.industry:
-                mock_insights = ["Omnichannel presence requires unified analytics", "Customer feedback directly impacts inventory decisions"]
-                mock_opps = ["Omnichannel Analytics", "Real-Time Alerting & Monitoring"]
-            elif "Healthcare" in company.industry:
-                mock_insights = ["Patient satisfaction is critical for retention and compliance", "Sensitive to privacy and regulatory requirements"]
-                mock_opps = ["Conversational Intelligence", "Real-Time Alerting & Monitoring"]
+            intel = self.pydantic_parser.parse(raw_text)
+        except Exception:
+            match = re.search(r'\{.*\}', raw_text, re.DOTALL)
+            if match:
+                json_str = match.group(0)
+                parsed = json.loads(json_str)
+                if "value" in parsed:
+                    parsed = parsed["value"]
+                intel = CompanyIntelligence(**parsed)
             else:
-                mock_insights = ["Scale requires automated analytics solutions", "Local language support is essential"]
-                mock_opps = ["Social Listening & Sentiment Analysis", "Omnichannel Analytics"]
-            return {
-                "company": company.to_dict(),
-                "key_insights": mock_insights,
-                "pain_points": company.challenges,
-                "opportunity_areas": mock_opps,
-                "competitive_context": {"likely_using": ["Sprinklr", "Hootsuite"], "gaps": ["Limited Arabic language support"], "lucidya_advantages": ["Purpose-built for MENA region", "Advanced Arabic NLP"]}
-            }
+                intel = self.json_parser.parse(raw_text)
+        
+        print(f"   ✓ Identified {len(intel.opportunity_areas)} opportunity areas\n")
+        return {
+            "company": company.to_dict(),
+            "key_insights": intel.key_insights,
+            "pain_points": company.challenges,
+            "opportunity_areas": intel.opportunity_areas,
+            "competitive_context": intel.competitive_context,
+            "is_fallback": False
+        }
+    
+    def fallback_intelligence(self, company: Company, reason: str) -> Dict:
+        """Mock intelligence used once every retry of a research job is exhausted"""
+        print(f"Research Agent: Retries exhausted for {company.name} ({reason}). Fallback to mock.")
+        mock = get_mock_research(company.industry)
+        return {
+            "company": company.to_dict(),
+            "key_insights": list(mock["key_insights"]),
+            "pain_points": company.challenges,
+            "opportunity_areas": list(mock["opportunity_areas"]),
+            "competitive_context": dict(MOCK_COMPETITIVE_CONTEXT),
+            "is_fallback": True,
+            "fallback_reason": reason
+        }
     
     def find_contacts(self, company_id: str) -> List[Dict]:
         contacts = [c.to_dict() for c in MOCK_CONTACTS if c.company_id == company_id]
@@ -113,15 +117,56 @@ class ResearchChain:
 
 
 def research_node(state: Dict) -> Dict:
-    """Node: Research each high-fit company"""
+    """Node: Research each high-fit, non-suppressed company through the durable job queue"""
     research_chain = ResearchChain()
-    processed = []
+    store = SuppressionStore()
+    suppressed = list(state.get("suppressed", []))
+    to_research = []
+    contacts_by_company = {}
     for company in state["high_fit_companies"]:
-        intelligence = research_chain.research_company(company)
-        contacts = research_chain.find_contacts(company.id)
-        processed.append({
-            "company": company.to_dict(), 
-            "intelligence": intelligence,
-            "contacts": contacts
+        reason = store.domain_reason(company.domain)
+        if reason:
+            print(f"Research Agent: Skipping {company.name} (domain {company.domain} suppressed: {reason})")
+            suppressed.append({"company_id": company.id, "domain": company.domain, "reason": reason})
+            continue
+        found = research_chain.find_contacts(company.id)
+        contacts = []
+        for contact in found:
+            reason = store.contact_reason(contact["email"])
+            if reason:
+                suppressed.append({"contact_id": contact["id"], "email": contact["email"], "reason": reason})
+            else:
+                contacts.append(contact)
+        if found and not contacts:
+            print(f"Research Agent: Skipping {company.name} (all contacts suppressed)")
+            continue
+        contacts_by_company[company.id] = contacts
+        to_research.append(company.to_dict())
+    
+    queue = TaskQueue()
+    try:
+        run_id = run_key("research", to_research)
+        queue.attach(run_id)
+        resumed = sum(not queue.enqueue(run_id, "research", payload["id"], payload) for payload in to_research)
+        if resumed:
+            print(f"Research Agent: Resuming {resumed} job(s) from an interrupted run")
+        run_worker(queue, run_id, {
+            "research": lambda payload: research_chain.research_company(Company(**payload))
         })
-    return {"processed_companies": processed}
\ No newline at end of file
+        
+        processed = []
+        for job in queue.jobs(run_id, "research"):
+            company = Company(**json.loads(job["payload"]))
+            if job["status"] == DONE:
+                intelligence = json.loads(job["result"])
+            else:
+                intelligence = research_chain.fallback_intelligence(company, job["last_error"])
+            processed.append({
+                "company": company.to_dict(), 
+                "intelligence": intelligence,
+                "contacts": contacts_by_company[company.id]
+            })
+        queue.finish_run(run_id)
+    finally:
+        queue.close()
+    return {"processed_companies": processed, "suppressed": suppressed}
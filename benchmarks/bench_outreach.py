@@ -0,0 +1,66 @@
+"""
+Outreach throughput benchmark: emails/sec per generation mode
+
+Run from the repo root:
+    python -m benchmarks.bench_outreach                       # template only, no Ollama needed
+    python -m benchmarks.bench_outreach --modes template hybrid llm variants
+    python -m benchmarks.bench_outreach --modes variants llm-k   # one call vs NUM_VARIANTS separate calls
+
+`llm-k` is the baseline for `variants`: it makes NUM_VARIANTS separate `llm`
+calls per contact, which is what drafting k candidates cost before.
+"""
+
+import argparse
+import time
+from data.mock_data import MOCK_COMPANIES, MOCK_CONTACTS
+from data.industry_data import get_mock_research
+
+
+def _workload():
+    items = []
+    for company in MOCK_COMPANIES:
+        mock = get_mock_research(company.industry)
+        intelligence = {
+            "company": company.to_dict(),
+            "key_insights": mock["key_insights"],
+            "pain_points": company.challenges,
+            "opportunity_areas": mock["opportunity_areas"]
+        }
+        for contact in MOCK_CONTACTS:
+            if contact.company_id == company.id:
+                items.append((contact.to_dict(), intelligence))
+    return items
+
+
+def bench_mode(mode: str, rounds: int):
+    from agents.outreach_agent import OutreachChain
+    from config import NUM_VARIANTS
+    items = _workload()
+    if mode == "llm-k":
+        chain = OutreachChain(mode="llm")
+        generate = lambda contact, intelligence: [chain.generate_llm_email(contact, intelligence)
+                                                  for _ in range(NUM_VARIANTS)]
+    else:
+        generate = OutreachChain(mode=mode).generate_email
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for contact, intelligence in items:
+            generate(contact, intelligence)
+    elapsed = time.perf_counter() - start
+    count = rounds * len(items)
+    print(f"{mode:>8}: {count} emails in {elapsed:.3f}s -> {count / elapsed:,.1f} emails/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["template"], choices=["template", "hybrid", "llm", "variants", "llm-k"])
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="passes over the mock contacts (default: 10000 for template, 1 for LLM modes)")
+    args = parser.parse_args()
+    for mode in args.modes:
+        bench_mode(mode, args.rounds or (10000 if mode == "template" else 1))
+
+
+if __name__ == "__main__":
+    main()
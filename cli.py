@@ -0,0 +1,110 @@
+"""
+Headless command-line entry point
+
+    python -m cli discover
+    python -m cli research
+    python -m cli outreach
+    python -m cli classify "Can you share pricing?"
+    python -m cli classify --from a@b.com "Please unsubscribe me"
+    python -m cli suppress add competitor.com someone@example.com
+    python -m cli suppress import do_not_contact.txt --bloom
+    python -m cli suppress clear --reason emailed
+
+Each command imports only what it needs, so `discover`, `classify` and
+`suppress` never load LangChain.
+"""
+
+import argparse
+import json
+import sys
+
+
+def cmd_discover(args):
+    from agents.discovery_agent import discover_companies_node
+    state = discover_companies_node({})
+    for company in state["high_fit_companies"]:
+        print(f"{company.id}  {company.fit_score:>3}  {company.name} ({company.industry}, {company.location})")
+
+
+def cmd_research(args):
+    from agents.discovery_agent import discover_companies_node
+    from agents.research_agent import research_node
+    from utils import to_serializable
+    state = discover_companies_node({})
+    state.update(research_node(state))
+    print(json.dumps(to_serializable(state["processed_companies"]), indent=2, ensure_ascii=False))
+
+
+def cmd_outreach(args):
+    from graph import build_graph
+    from utils import export_results, prepare_streamlit_data
+    from data.mock_data import MOCK_COMPANIES
+    result_state = build_graph().invoke({"companies": MOCK_COMPANIES})
+    export_results(result_state)
+    print(json.dumps(prepare_streamlit_data(result_state)["summary"], indent=2))
+
+
+def cmd_classify(args):
+    from agents.email_handler_agent import classify_response, generate_auto_response, handle_reply
+    content = args.text if args.text is not None else sys.stdin.read()
+    if args.sender:
+        print(json.dumps(handle_reply(args.sender, content), indent=2))
+        return
+    classification = classify_response(content)
+    print(json.dumps({
+        "classification": classification,
+        "auto_response": generate_auto_response(classification, content)
+    }, indent=2))
+
+
+def cmd_suppress(args):
+    from suppression import SuppressionStore
+    store = SuppressionStore()
+    if args.action in ("add", "import", "remove", "check") and not args.entries:
+        raise SystemExit(f"suppress {args.action}: at least one entry is required")
+    if args.action == "check":
+        for entry in args.entries:
+            reason = store.contact_reason(entry) if '@' in entry else store.domain_reason(entry)
+            print(f"{entry}: {reason or 'ok'}")
+        return
+    if args.action == "clear":
+        store.clear(args.reason)
+    elif args.action == "remove":
+        for entry in args.entries:
+            if not store.remove(entry):
+                print(f"{entry}: not in the exact lists")
+    elif args.action == "import":
+        for path in args.entries:
+            with open(path, encoding='utf-8') as f:
+                store.import_list(f, args.reason or "do_not_contact", use_bloom=args.bloom)
+    else:
+        store.import_list(args.entries, args.reason or "do_not_contact")
+    store.save()
+    print(f"{len(store.emails)} email(s), {len(store.domains)} domain(s)"
+          + (f", {store.bloom_count} Bloom filter entries in {len(store.blooms)} filter(s)" if store.blooms else "")
+          + " suppressed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Lucidya Marketing System")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("discover", help="list high-fit companies").set_defaults(func=cmd_discover)
+    commands.add_parser("research", help="discover and research high-fit companies").set_defaults(func=cmd_research)
+    commands.add_parser("outreach", help="run the full workflow and export results").set_defaults(func=cmd_outreach)
+    classify = commands.add_parser("classify", help="classify an email reply (text argument or stdin)")
+    classify.add_argument("text", nargs="?")
+    classify.add_argument("--from", dest="sender", help="sender address; NEGATIVE replies are added to the suppression list")
+    classify.set_defaults(func=cmd_classify)
+    suppress = commands.add_parser("suppress", help="manage the do-not-contact list")
+    suppress.add_argument("action", choices=["add", "import", "check", "remove", "clear"])
+    suppress.add_argument("entries", nargs="*", help="emails/domains, or files (one entry per line) for import")
+    suppress.add_argument("--reason", help="reason recorded for add/import (default: do_not_contact; kept per "
+                                           "filter for --bloom imports); for clear, only entries with this reason")
+    suppress.add_argument("--bloom", action="store_true", help="import into the Bloom filter (for very large lists)")
+    suppress.set_defaults(func=cmd_suppress)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
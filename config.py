@@ -2,25 +2,30 @@
 Configuration for the Lucidya Marketing App
 """
 
-from langchain_ollama import OllamaLLM
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser  
-from pydantic import BaseModel, Field
-from typing import List
-
 OLLAMA_MODEL = 'llama3:latest'
 OLLAMA_BASE_URL = 'http://localhost:11434'
 
-llm = OllamaLLM(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, temperature=0.0)
-
 MIN_FIT_SCORE = 85
 OUTPUT_FILE = 'lucidya_marketing_system_output.json'
 
-class CompanyIntelligence(BaseModel):
-    key_insights: List[str] = Field(description="Key insights about the company")
-    opportunity_areas: List[str] = Field(description="Opportunity areas for Lucidya")
-    competitive_context: dict = Field(description="Competitive analysis dict")
+# 'llm': full email generated by the LLM; 'hybrid': LLM writes only the opening
+# paragraph of a precompiled industry template; 'template': no LLM call;
+# 'variants': NUM_VARIANTS full emails in one LLM call, best kept, rest stored for A/B tests
+OUTREACH_MODES = ('llm', 'hybrid', 'template', 'variants')
+OUTREACH_MODE = 'hybrid'
+NUM_VARIANTS = 3
+
+QUEUE_DB_FILE = 'lucidya_task_queue.db'
+MAX_JOB_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0  # seconds; doubled on every retry
+JOB_LEASE_SECONDS = 300
+WORKER_BATCH_SIZE = 5
+QUEUE_RETENTION_DAYS = 7  # abandoned jobs and dead letters older than this are purged
 
-class EmailOutput(BaseModel):
-    subject: str = Field(description="Email subject")
-    body: str = Field(description="Email body")
\ No newline at end of file
+SUPPRESSION_FILE = 'lucidya_suppression.json'
+SUPPRESSION_BLOOM_FILE = 'lucidya_suppression.bloom'
+BLOOM_ERROR_RATE = 0.001
+# Record every contact a draft was generated for as 'emailed', so later runs skip
+# them. Off by default: nothing is actually sent yet, and with it on a repeated
+# run processes no companies. Reset with `python -m cli suppress clear --reason emailed`.
+SUPPRESS_EMAILED = False
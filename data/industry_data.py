@@ -0,0 +1,24 @@
+"""
+Per-industry use cases and mock research insights, loaded once from industry_data.json
+"""
+
+import json
+import os
+from typing import Dict
+
+with open(os.path.join(os.path.dirname(__file__), 'industry_data.json'), encoding='utf-8') as f:
+    _DATA = json.load(f)
+
+DEFAULT_INDUSTRY = _DATA["default_industry"]
+USE_CASES: Dict[str, Dict] = _DATA["use_cases"]
+MOCK_RESEARCH = _DATA["mock_research"]
+MOCK_COMPETITIVE_CONTEXT: Dict = _DATA["mock_competitive_context"]
+
+
+def get_use_case(industry: str) -> Dict:
+    return USE_CASES.get(industry, USE_CASES[DEFAULT_INDUSTRY])
+
+
+def get_mock_research(industry: str) -> Dict:
+    """First entry whose `match` is a substring of the industry; the last entry matches everything"""
+    return next(entry for entry in MOCK_RESEARCH if entry["match"] in industry)
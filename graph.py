@@ -15,6 +15,7 @@ class AppState(TypedDict):
     high_fit_companies: list
     processed_companies: list
     sent_emails: list
+    suppressed: list
 
 
 def build_graph() -> StateGraph:
@@ -0,0 +1,28 @@
+"""
+LLM client and structured-output schemas, created on first use
+
+Kept apart from config so that modules needing only settings do not import
+LangChain, langchain_ollama or pydantic.
+"""
+
+from functools import lru_cache
+from typing import List
+from pydantic import BaseModel, Field
+from config import OLLAMA_MODEL, OLLAMA_BASE_URL
+
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """Shared OllamaLLM instance, constructed on the first call"""
+    from langchain_ollama import OllamaLLM
+    return OllamaLLM(model=OLLAMA_MODEL, base_url=OLLAMA_BASE_URL, temperature=0.0)
+
+
+class CompanyIntelligence(BaseModel):
+    key_insights: List[str] = Field(description="Key insights about the company")
+    opportunity_areas: List[str] = Field(description="Opportunity areas for Lucidya")
+    competitive_context: dict = Field(description="Competitive analysis dict")
+
+class EmailOutput(BaseModel):
+    subject: str = Field(description="Email subject")
+    body: str = Field(description="Email body")
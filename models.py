@@ -2,8 +2,8 @@
 Data models for the Lucidya Marketing System
 """
 
-from typing import List, Dict
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
 
@@ -47,6 +47,9 @@ class OutreachEmail:
     body: str
     generated_at: str
     personalization_factors: List[str]
+    is_fallback: bool = False
+    score: Optional[float] = None
+    variants: List[Dict] = field(default_factory=list)  # ranked alternates kept for A/B testing
     
     def to_dict(self) -> Dict:
         return asdict(self)
\ No newline at end of file
@@ -3,10 +3,9 @@ Streamlit UI for Lucidya Marketing App
 """
 
 import streamlit as st
-from graph import build_graph
 from utils import export_results, prepare_streamlit_data, to_serializable 
 from config import MIN_FIT_SCORE
-from agents.email_handler_agent import classify_response, generate_auto_response
+from agents.email_handler_agent import handle_reply
 from data.mock_data import MOCK_COMPANIES  
 
 
@@ -20,6 +19,7 @@ run_demo = st.sidebar.checkbox("Run Email Handling Demo")
 
 if st.button("Run Workflow", type="primary"):
     with st.spinner("Executing AI workflow..."):
+        from graph import build_graph  # LangGraph/LangChain load only when the workflow runs
         graph = build_graph()
         initial_state = {"companies": MOCK_COMPANIES} 
         result_state = graph.invoke(initial_state)
@@ -37,6 +37,11 @@ if "state" in st.session_state:
     col1.metric("Companies Discovered", data["summary"]["companies_discovered"])
     col2.metric("Companies Processed", data["summary"]["companies_processed"])
     col3.metric("Emails Generated", data["summary"]["emails_generated"])
+    if data["summary"]["research_fallbacks"] or data["summary"]["email_fallbacks"]:
+        st.warning(f"Retries exhausted: {data['summary']['research_fallbacks']} research and "
+                   f"{data['summary']['email_fallbacks']} email job(s) fell back to templates.")
+    if data["summary"]["suppressed"]:
+        st.info(f"Skipped {data['summary']['suppressed']} suppressed contact(s)/domain(s) (already emailed, unsubscribed or do-not-contact).")
 
     for i, processed in enumerate(data["processed_companies"]):
         company = processed["company"]
@@ -51,6 +56,8 @@ if "state" in st.session_state:
             for challenge in company['challenges'][:3]:
                 st.write(f"• {challenge}")
             
+            if intel.get('is_fallback'):
+                st.warning(f"Mock intelligence (retries exhausted): {intel.get('fallback_reason')}")
             st.subheader("Key Insights (LLM-Generated)")
             for insight in intel['key_insights']:
                 st.write(f"• {insight}")
@@ -65,11 +72,17 @@ if "state" in st.session_state:
                 if email_item:
                     email = email_item["email"]
                     with st.expander(f"To: {contact['name']} - {email['subject']}"):
+                        if email.get('is_fallback'):
+                            st.warning("Template fallback (retries exhausted)")
                         st.write("**Body:**")
                         st.markdown(email['body'])
                         st.write("**Personalization Factors:**")
                         for factor in email['personalization_factors']:
                             st.write(f"• {factor}")
+                        if email.get('variants'):
+                            st.write(f"**A/B Alternates** (sent variant score: {email['score']}):")
+                            for variant in email['variants']:
+                                st.write(f"• {variant['subject']} (score: {variant['score']})")
 
     if run_demo:
         st.sidebar.header("Email Response Demo")
@@ -89,8 +102,9 @@ if "state" in st.session_state:
         ]
         
         for resp in mock_responses:
-            classification = classify_response(resp["content"])
-            auto_resp = generate_auto_response(classification, resp["content"])
+            handled = handle_reply(resp["from"], resp["content"])
+            classification = handled["classification"]
+            auto_resp = handled["auto_response"]
             
             col1, col2 = st.sidebar.columns(2)
             col1.write(f"**From:** {resp['from']}")
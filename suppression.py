@@ -0,0 +1,229 @@
+"""
+Suppression index: contacts and domains that must not be researched or emailed
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+from typing import BinaryIO, Dict, Iterable, List, Optional
+from config import SUPPRESSION_FILE, SUPPRESSION_BLOOM_FILE, BLOOM_ERROR_RATE
+
+_BLOOM_MAGIC = b'LSBF1'
+
+
+def email_domain(email: str) -> str:
+    return email.rsplit('@', 1)[-1].strip().lower()
+
+
+class BloomFilter:
+    """
+    Bit array sized for `capacity` items at `error_rate`, with k hash
+    positions per item (double hashing over blake2b). Adding more than
+    `capacity` items raises the false-positive rate, so callers start a
+    new filter instead (see SuppressionStore.import_list).
+    """
+
+    _HEADER = struct.Struct('<QQQQH')
+    MIN_CAPACITY = 1024  # tiny bit arrays make the double-hashed positions collide
+
+    def __init__(self, capacity: int, reason: str = "do_not_contact", error_rate: float = BLOOM_ERROR_RATE):
+        self.capacity = max(self.MIN_CAPACITY, capacity)
+        self.reason = reason
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def has_room(self, n: int) -> bool:
+        return self.count + n <= self.capacity
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def write(self, f: BinaryIO):
+        reason = self.reason.encode('utf-8')
+        f.write(self._HEADER.pack(self.capacity, self.num_bits, self.num_hashes, self.count, len(reason)))
+        f.write(reason)
+        f.write(self.bits)
+
+    @classmethod
+    def read(cls, f: BinaryIO) -> 'BloomFilter':
+        capacity, num_bits, num_hashes, count, reason_len = cls._HEADER.unpack(f.read(cls._HEADER.size))
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.num_bits, bloom.num_hashes, bloom.count = capacity, num_bits, num_hashes, count
+        bloom.reason = f.read(reason_len).decode('utf-8')
+        bloom.bits = bytearray(f.read((num_bits + 7) // 8))
+        return bloom
+
+
+def save_blooms(blooms: List[BloomFilter], path: str):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_BLOOM_MAGIC)
+        f.write(struct.pack('<I', len(blooms)))
+        for bloom in blooms:
+            bloom.write(f)
+    os.replace(tmp_path, path)
+
+
+def load_blooms(path: str) -> List[BloomFilter]:
+    with open(path, 'rb') as f:
+        if f.read(len(_BLOOM_MAGIC)) != _BLOOM_MAGIC:
+            raise ValueError(f"{path} is not a suppression Bloom filter file; re-import the list")
+        (num_filters,) = struct.unpack('<I', f.read(4))
+        return [BloomFilter.read(f) for _ in range(num_filters)]
+
+
+class SuppressionStore:
+    """
+    Exact hash maps of suppressed emails and domains (value = reason),
+    persisted as JSON, plus optional Bloom filters for bulk do-not-contact
+    lists too large to keep as exact sets. Each bulk import that does not
+    fit the current filter's capacity (or has a different reason) starts a
+    new filter, so the false-positive rate stays near BLOOM_ERROR_RATE per
+    filter. A Bloom hit may be a false positive, which errs on the side of
+    not contacting.
+    """
+
+    def __init__(self, path: str = SUPPRESSION_FILE, bloom_path: str = SUPPRESSION_BLOOM_FILE):
+        self.path = path
+        self.bloom_path = bloom_path
+        self.emails: Dict[str, str] = {}
+        self.domains: Dict[str, str] = {}
+        self.blooms: List[BloomFilter] = []
+        self._blooms_changed = False  # save() only rewrites the Bloom file when this store changed it
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.emails = data.get("emails", {})
+            self.domains = data.get("domains", {})
+        if os.path.exists(bloom_path):
+            self.blooms = load_blooms(bloom_path)
+
+    @property
+    def bloom_count(self) -> int:
+        return sum(bloom.count for bloom in self.blooms)
+
+    def add_email(self, email: str, reason: str):
+        self.emails[email.strip().lower()] = reason
+
+    def add_domain(self, domain: str, reason: str):
+        self.domains[domain.strip().lower()] = reason
+
+    def remove(self, entry: str) -> bool:
+        """Drop an email or domain from the exact lists (Bloom filter entries cannot be removed)"""
+        entry = entry.strip().lower()
+        return (self.emails.pop(entry, None) or self.domains.pop(entry, None)) is not None
+
+    def clear(self, reason: Optional[str] = None):
+        """Drop every exact entry with this reason, or everything (Bloom filters included) if reason is None"""
+        if reason is None:
+            self.emails, self.domains, self.blooms = {}, {}, []
+            self._blooms_changed = True
+            return
+        self.emails = {k: v for k, v in self.emails.items() if v != reason}
+        self.domains = {k: v for k, v in self.domains.items() if v != reason}
+        kept = [bloom for bloom in self.blooms if bloom.reason != reason]
+        self._blooms_changed |= len(kept) != len(self.blooms)
+        self.blooms = kept
+
+    def import_list(self, entries: Iterable[str], reason: str = "do_not_contact", use_bloom: bool = False,
+                    capacity: Optional[int] = None):
+        """Add emails and domains (one per entry); with use_bloom they go into a Bloom filter only"""
+        entries = [e.strip().lower() for e in entries]
+        entries = [e for e in entries if e and not e.startswith('#')]
+        if not use_bloom:
+            for entry in entries:
+                if '@' in entry:
+                    self.add_email(entry, reason)
+                else:
+                    self.add_domain(entry, reason)
+            return
+        last = self.blooms[-1] if self.blooms else None
+        if last is None or last.reason != reason or not last.has_room(len(entries)):
+            # Grow geometrically so repeated small imports do not pile up tiny filters
+            grown = 2 * last.capacity if last is not None and last.reason == reason else 0
+            self.blooms.append(BloomFilter(max(capacity or len(entries), grown), reason))
+        for entry in entries:
+            self.blooms[-1].add(entry)
+        self._blooms_changed = True
+
+    def _bloom_reason(self, item: str) -> Optional[str]:
+        for bloom in self.blooms:
+            if item in bloom:
+                return bloom.reason
+        return None
+
+    def _domain_reason(self, domain: str) -> Optional[str]:
+        # Check the domain and each parent, so suppressing example.com covers mail.example.com
+        labels = domain.split('.')
+        for i in range(len(labels) - 1):
+            candidate = '.'.join(labels[i:])
+            if candidate in self.domains:
+                return self.domains[candidate]
+            reason = self._bloom_reason(candidate)
+            if reason:
+                return reason
+        return None
+
+    def domain_reason(self, domain: str) -> Optional[str]:
+        """Why a domain is suppressed, or None if it may be contacted"""
+        return self._domain_reason(domain.strip().lower())
+
+    def contact_reason(self, email: str) -> Optional[str]:
+        """Why an email address is suppressed (itself or its domain), or None if it may be contacted"""
+        email = email.strip().lower()
+        if email in self.emails:
+            return self.emails[email]
+        return self._bloom_reason(email) or self._domain_reason(email_domain(email))
+
+    def is_suppressed(self, email: str) -> bool:
+        return self.contact_reason(email) is not None
+
+    def save(self):
+        """
+        Write this store's exact lists, and its Bloom filters if it changed them.
+        Long-lived callers that only add entries should use add_and_save() so
+        they do not overwrite entries written since the store was loaded.
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"emails": self.emails, "domains": self.domains}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        if not self._blooms_changed:
+            return
+        if self.blooms:
+            save_blooms(self.blooms, self.bloom_path)
+        elif os.path.exists(self.bloom_path):
+            os.remove(self.bloom_path)
+        self._blooms_changed = False
+
+    def add_and_save(self, emails: Optional[Dict[str, str]] = None, domains: Optional[Dict[str, str]] = None):
+        """
+        Add emails/domains (value = reason) to the lists as they are on disk now,
+        then save; this store is refreshed to the merged state
+        """
+        if not emails and not domains:
+            return
+        latest = SuppressionStore(self.path, self.bloom_path)
+        for email, reason in (emails or {}).items():
+            latest.add_email(email, reason)
+        for domain, reason in (domains or {}).items():
+            latest.add_domain(domain, reason)
+        latest.save()
+        self.emails, self.domains, self.blooms = latest.emails, latest.domains, latest.blooms
+        self._blooms_changed = False
@@ -0,0 +1,273 @@
+"""
+Durable SQLite-backed job queue for research and outreach tasks
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from config import (QUEUE_DB_FILE, MAX_JOB_ATTEMPTS, RETRY_BASE_DELAY, WORKER_BATCH_SIZE, JOB_LEASE_SECONDS,
+                    QUEUE_RETENTION_DAYS)
+
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+DEAD = "dead"
+
+POLL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_run_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (run_id, status, next_run_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_key ON jobs (run_id, job_key);
+CREATE TABLE IF NOT EXISTS run_owners (
+    run_id TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (run_id, owner_id)
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+def run_key(kind: str, payloads: List[Dict]) -> str:
+    """
+    Stable identifier for a batch of jobs, derived from their payloads, so a
+    restarted run with the same input resumes the unfinished run instead of
+    starting over
+    """
+    digest = hashlib.sha256(kind.encode('utf-8'))
+    for payload in payloads:
+        digest.update(json.dumps(payload, sort_keys=True).encode('utf-8'))
+    return f"{kind}:{digest.hexdigest()[:32]}"
+
+
+class TaskQueue:
+    """
+    Each job is a row with status, attempts and a next_run_at timestamp.
+    Transient failures are retried with exponential backoff; once
+    max_attempts is reached, or on a non-retryable error, the job is copied
+    to dead_letters and marked dead. Jobs of a run
+    stay in the table until finish_run(), so a crashed run is picked up
+    again (done jobs keep their results) when the same run key is enqueued.
+    """
+
+    def __init__(self, db_path: str = QUEUE_DB_FILE, max_attempts: int = MAX_JOB_ATTEMPTS,
+                 base_delay: float = RETRY_BASE_DELAY, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.lease_seconds = lease_seconds
+        self.owner_id = uuid.uuid4().hex
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        if columns and "job_key" not in columns:
+            # Queue files from before resumable runs hold only finished history
+            self.conn.execute("DROP TABLE jobs")
+        self.conn.executescript(_SCHEMA)
+        self.purge(QUEUE_RETENTION_DAYS * 86400)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, run_id: str, kind: str, job_key: str, payload: Dict) -> bool:
+        """Add a job; returns False if this run already has it (resumed from an earlier attempt)"""
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (run_id, job_key, kind, payload, max_attempts, next_run_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, job_key, kind, json.dumps(payload), self.max_attempts, now, now, now)
+        )
+        return cur.rowcount == 1
+
+    def attach(self, run_id: str):
+        """Register this queue as an owner of the run; the registration is renewed on every claim"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO run_owners (run_id, owner_id, expires_at) VALUES (?, ?, ?)",
+            (run_id, self.owner_id, time.time() + self.lease_seconds)
+        )
+
+    def finish_run(self, run_id: str):
+        """
+        Detach from the run once its results have been consumed, and drop its
+        jobs if no other live owner is still reading them; dead letters are kept
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "DELETE FROM run_owners WHERE run_id = ? AND (owner_id = ? OR expires_at < ?)",
+                (run_id, self.owner_id, now)
+            )
+            others = self.conn.execute("SELECT COUNT(*) FROM run_owners WHERE run_id = ?", (run_id,)).fetchone()[0]
+            if not others:
+                self.conn.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def purge(self, max_age_seconds: float):
+        """Delete abandoned jobs and dead letters older than max_age_seconds"""
+        cutoff = time.time() - max_age_seconds
+        self.conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+        self.conn.execute("DELETE FROM dead_letters WHERE failed_at < ?", (cutoff,))
+        self.conn.execute("DELETE FROM run_owners WHERE expires_at < ?", (cutoff,))
+
+    def claim_batch(self, run_id: str, limit: int = WORKER_BATCH_SIZE) -> List[sqlite3.Row]:
+        """Lease up to `limit` due jobs (including ones whose worker died mid-run)"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT * FROM jobs WHERE run_id = ? AND ("
+                "(status = ? AND next_run_at <= ?) OR (status = ? AND locked_until < ?)"
+                ") ORDER BY next_run_at, id LIMIT ?",
+                (run_id, PENDING, now, RUNNING, now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE jobs SET status = ?, locked_until = ?, updated_at = ? WHERE id = ?",
+                [(RUNNING, now + self.lease_seconds, now, row["id"]) for row in rows]
+            )
+            self.conn.execute(
+                "UPDATE run_owners SET expires_at = ? WHERE run_id = ? AND owner_id = ?",
+                (now + self.lease_seconds, run_id, self.owner_id)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def complete(self, job_id: int, result: Dict):
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, locked_until = NULL, updated_at = ? WHERE id = ?",
+            (DONE, json.dumps(result), time.time(), job_id)
+        )
+
+    def fail(self, job: sqlite3.Row, error: str, retry: bool = True) -> str:
+        """Record a failed attempt; returns the job's new status (dead at once when retry is False)"""
+        now = time.time()
+        attempts = job["attempts"] + 1
+        if not retry or attempts >= job["max_attempts"]:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, last_error = ?, locked_until = NULL, updated_at = ? "
+                    "WHERE id = ?",
+                    (DEAD, attempts, error, now, job["id"])
+                )
+                self.conn.execute(
+                    "INSERT INTO dead_letters (job_id, run_id, kind, payload, attempts, last_error, failed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job["id"], job["run_id"], job["kind"], job["payload"], attempts, error, now)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return DEAD
+        delay = self.base_delay * (2 ** (attempts - 1))
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, attempts = ?, last_error = ?, next_run_at = ?, locked_until = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (PENDING, attempts, error, now + delay, now, job["id"])
+        )
+        return PENDING
+
+    def next_due_in(self, run_id: str) -> Optional[float]:
+        """Seconds until the next job of this run becomes claimable, None if nothing is outstanding"""
+        row = self.conn.execute(
+            "SELECT MIN(CASE WHEN status = ? THEN next_run_at ELSE locked_until END) AS due "
+            "FROM jobs WHERE run_id = ? AND status IN (?, ?)",
+            (PENDING, run_id, PENDING, RUNNING)
+        ).fetchone()
+        if row["due"] is None:
+            return None
+        return max(0.0, row["due"] - time.time())
+
+    def jobs(self, run_id: str, kind: Optional[str] = None) -> List[sqlite3.Row]:
+        if kind is None:
+            return self.conn.execute("SELECT * FROM jobs WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+        return self.conn.execute(
+            "SELECT * FROM jobs WHERE run_id = ? AND kind = ? ORDER BY id", (run_id, kind)
+        ).fetchall()
+
+    def dead_letters(self, run_id: Optional[str] = None) -> List[sqlite3.Row]:
+        if run_id is None:
+            return self.conn.execute("SELECT * FROM dead_letters ORDER BY id").fetchall()
+        return self.conn.execute(
+            "SELECT * FROM dead_letters WHERE run_id = ? ORDER BY id", (run_id,)
+        ).fetchall()
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Errors worth retrying: timeouts, connection failures and server-side
+    HTTP/Ollama errors. Parse and validation errors are not, since the LLM
+    runs at temperature 0 and returns the same output on every retry.
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    module = type(exc).__module__.split('.')[0]
+    if module in ("httpx", "httpcore", "ollama"):
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None) if response is not None else getattr(exc, "status_code", None)
+        return status is None or status < 0 or status >= 500 or status == 429
+    return False
+
+
+def run_worker(queue: TaskQueue, run_id: str, handlers: Dict[str, Callable[[Dict], Dict]],
+               batch_size: int = WORKER_BATCH_SIZE, retryable: Callable[[Exception], bool] = is_transient):
+    """
+    Drain every job of a run, pulling them in batches, until each is done or
+    dead-lettered. Only failures for which `retryable` is true are retried.
+    """
+    while True:
+        batch = queue.claim_batch(run_id, batch_size)
+        if not batch:
+            wait = queue.next_due_in(run_id)
+            if wait is None:
+                return
+            # Poll rather than sleep out a lease: another owner may finish its job early
+            time.sleep(min(wait, POLL_SECONDS))
+            continue
+        for job in batch:
+            try:
+                result = handlers[job["kind"]](json.loads(job["payload"]))
+                queue.complete(job["id"], result)
+            except Exception as e:
+                status = queue.fail(job, f"{type(e).__name__}: {e}", retry=retryable(e))
+                if status == DEAD:
+                    print(f"   ✗ Job {job['id']} ({job['kind']}) dead-lettered after {job['attempts'] + 1} attempts: {e}")
+                else:
+                    print(f"   ↻ Job {job['id']} ({job['kind']}) failed, will retry: {e}")
@@ -46,7 +46,10 @@ def prepare_streamlit_data(state: Dict) -> Dict:
         "summary": {
             "companies_discovered": len(state.get("companies", [])),
             "companies_processed": len(processed),
-            "emails_generated": len(sent_emails)
+            "emails_generated": len(sent_emails),
+            "research_fallbacks": sum(1 for p in processed if p["intelligence"].get("is_fallback")),
+            "email_fallbacks": sum(1 for e in sent_emails if e["email"].get("is_fallback")),
+            "suppressed": len(state.get("suppressed", []))
         },
         "processed_companies": processed,
         "sent_emails": sent_emails